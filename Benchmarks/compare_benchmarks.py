@@ -0,0 +1,103 @@
+import argparse
+import json
+import sys
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def relative_change(old_value, new_value):
+    if old_value:
+        return (new_value - old_value) / old_value
+    # any rise from zero is a regression, whatever the threshold
+    return float("inf") if new_value > 0 else 0.0
+
+
+def compare(baseline, current, threshold=0.25, min_seconds=0.001, allow_missing=False):
+    """
+    Compare two result files produced by run_benchmarks.py.
+    Timings are the best of the timed runs (`wall_s`, stage `best_s`). A metric regresses
+    when it grows by more than `threshold` (relative). Timings below `min_seconds` in both
+    runs are ignored, they are mostly noise.
+    A benchmark, stage or counter present in the baseline but missing or not `ok` in the
+    current run is a regression unless `allow_missing` is set; an `error` status always is.
+    Returns a list of rows (benchmark, metric, old, new, relative change, regressed);
+    the change is None for status rows.
+    """
+    rows = []
+    names = list(baseline["benchmarks"])
+    names += [name for name in current["benchmarks"] if name not in baseline["benchmarks"]]
+    for name in names:
+        old = baseline["benchmarks"].get(name)
+        new = current["benchmarks"].get(name)
+        old_status = old["status"] if old else "missing"
+        new_status = new["status"] if new else "missing"
+        if old_status != "ok" or new_status != "ok":
+            if new_status == "error":
+                rows.append((name, "status", old_status, new_status, None, True))
+            elif old_status != new_status:
+                rows.append((name, "status", old_status, new_status, None,
+                             old_status == "ok" and not allow_missing))
+            continue
+
+        metrics = [("wall_s", old["wall_s"], new["wall_s"])]
+        for stage, old_stats in old["stages"].items():
+            new_stats = new["stages"].get(stage)
+            if new_stats is None:
+                rows.append((name, f"{stage}.best_s", "present", "missing", None, not allow_missing))
+                continue
+            metrics.append((f"{stage}.best_s", old_stats["best_s"], new_stats["best_s"]))
+            if "peak_bytes" in old_stats and "peak_bytes" in new_stats:
+                metrics.append((f"{stage}.peak_bytes", old_stats["peak_bytes"], new_stats["peak_bytes"]))
+        for counter, old_value in old["counters"].items():
+            if counter not in new["counters"]:
+                rows.append((name, f"counters.{counter}", "present", "missing", None, not allow_missing))
+                continue
+            metrics.append((f"counters.{counter}", old_value, new["counters"][counter]))
+
+        for metric, old_value, new_value in metrics:
+            if metric.endswith("_s") and max(old_value, new_value) < min_seconds:
+                continue
+            change = relative_change(old_value, new_value)
+            rows.append((name, metric, old_value, new_value, change, change > threshold))
+    return rows
+
+
+def format_report(rows, threshold):
+    lines = [f"{'Benchmark':<12} {'Metric':<45} {'Old':>12} {'New':>12} {'Change':>9}"]
+    for name, metric, old_value, new_value, change, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        if change is None:
+            lines.append(f"{name:<12} {metric:<45} {old_value:>12} {new_value:>12} {'':>9}{flag}")
+        else:
+            lines.append(f"{name:<12} {metric:<45} {old_value:>12.6g} {new_value:>12.6g} {change:>+8.1%}{flag}")
+    regressions = sum(1 for row in rows if row[5])
+    lines.append(f"\n{regressions} regression(s) above {threshold:.0%} or missing/failed")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff two benchmark result files and report regressions.")
+    parser.add_argument("baseline", help="results of the reference run")
+    parser.add_argument("current", help="results of the run to check")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative increase (default: 0.25)")
+    parser.add_argument("--min-seconds", type=float, default=0.001, help="ignore timings below this value")
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="do not fail when a benchmark, stage or counter of the baseline is skipped or missing")
+    args = parser.parse_args()
+
+    baseline, current = load_results(args.baseline), load_results(args.current)
+    for key in ("scale", "repeat", "memory"):
+        if baseline["meta"].get(key) != current["meta"].get(key):
+            print(f"Warning: runs use different --{key} ({baseline['meta'].get(key)} vs {current['meta'].get(key)})")
+
+    rows = compare(baseline, current, args.threshold, args.min_seconds, args.allow_missing)
+    print(format_report(rows, args.threshold))
+    # non-zero exit code so the comparison can gate a CI job
+    sys.exit(1 if any(row[5] for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
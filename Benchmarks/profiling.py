@@ -0,0 +1,155 @@
+import functools
+import json
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+
+class MemorySink:
+    """ Keep every emitted event in a list (useful for inspection in a notebook). """
+
+    def __init__(self):
+        self.events: List[dict] = []
+
+    def __call__(self, event: dict):
+        self.events.append(event)
+
+
+class JsonLinesSink:
+    """ Write every emitted event as one JSON object per line (the file is overwritten). """
+
+    def __init__(self, path: str):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def __call__(self, event: dict):
+        self.file.write(json.dumps(event) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class Profiler:
+    """
+    Lightweight instrumentation: stage timers, call counters and optional tracemalloc peaks.
+    Every finished stage is sent to `sink` (any callable taking a dict), and aggregated
+    statistics are available through `summary()`.
+    """
+
+    def __init__(self, sink: Optional[Callable[[dict], None]] = None, trace_memory: bool = False):
+        self.sink = sink
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, dict] = {}
+        self.counters: Dict[str, int] = defaultdict(int)
+        # one [start_bytes, peak_bytes] entry per currently open stage
+        self._memory_stack: List[List[int]] = []
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        return self
+
+    def __exit__(self, *exc):
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    # counters
+    def count(self, name: str, n: int = 1):
+        self.counters[name] += n
+
+    # stage timers
+    @contextmanager
+    def stage(self, name: str):
+        """ Time the enclosed block; nested stages are allowed. """
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            self._push_memory_frame()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = self._pop_memory_frame() if tracing else None
+            self._record(name, elapsed, peak)
+
+    def _push_memory_frame(self):
+        current, peak = tracemalloc.get_traced_memory()
+        # the peak reached so far belongs to the enclosing stage, save it before resetting
+        if self._memory_stack:
+            self._memory_stack[-1][1] = max(self._memory_stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        self._memory_stack.append([current, current])
+
+    def _pop_memory_frame(self) -> int:
+        _, peak = tracemalloc.get_traced_memory()
+        start, frame_peak = self._memory_stack.pop()
+        frame_peak = max(frame_peak, peak)
+        if self._memory_stack:
+            self._memory_stack[-1][1] = max(self._memory_stack[-1][1], frame_peak)
+        tracemalloc.reset_peak()
+        return frame_peak - start
+
+    def _record(self, name: str, elapsed: float, peak: Optional[int]):
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = {"calls": 0, "total_s": 0.0, "min_s": elapsed, "max_s": elapsed}
+            self.stages[name] = stats
+        stats["calls"] += 1
+        stats["total_s"] += elapsed
+        stats["min_s"] = min(stats["min_s"], elapsed)
+        stats["max_s"] = max(stats["max_s"], elapsed)
+        if peak is not None:
+            stats["peak_bytes"] = max(stats.get("peak_bytes", 0), peak)
+
+        if self.sink is not None:
+            event = {"stage": name, "elapsed_s": elapsed}
+            if peak is not None:
+                event["peak_bytes"] = peak
+            self.sink(event)
+
+    # hooks on existing code
+    def timed(self, func: Callable, name: str) -> Callable:
+        """ Return `func` wrapped in a stage timer. """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def counted(self, func: Callable, name: str) -> Callable:
+        """ Return `func` wrapped in a call counter (cheaper than a timer for very hot functions). """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            self.counters[name] += 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    @contextmanager
+    def instrument(self, owner, timed: Dict[str, str] = None, counted: Dict[str, str] = None):
+        """
+        Temporarily patch attributes of `owner` (a class or a module).
+        :param timed: attribute name -> stage name, wrapped with a stage timer
+        :param counted: attribute name -> counter name, wrapped with a call counter
+        """
+        originals = {}
+        try:
+            for attr, name in (timed or {}).items():
+                originals.setdefault(attr, owner.__dict__[attr])
+                setattr(owner, attr, self.timed(getattr(owner, attr), name))
+            for attr, name in (counted or {}).items():
+                originals.setdefault(attr, owner.__dict__[attr])
+                setattr(owner, attr, self.counted(getattr(owner, attr), name))
+            yield self
+        finally:
+            for attr, original in originals.items():
+                setattr(owner, attr, original)
+
+    def summary(self) -> dict:
+        stages = {}
+        for name, stats in self.stages.items():
+            stages[name] = dict(stats, mean_s=stats["total_s"] / stats["calls"])
+        return {"stages": stages, "counters": dict(self.counters)}
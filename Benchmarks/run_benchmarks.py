@@ -0,0 +1,338 @@
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+from profiling import JsonLinesSink, Profiler
+
+# never reach the network: models must already be in the local cache, otherwise the benchmark is skipped
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS_PATH = os.path.join(ROOT, "Lab2", "romanian_corpus.txt")
+
+QA_TEXT = """
+Water boils at 100 degrees Celsius at standard atmospheric pressure. However, the boiling
+point decreases at higher altitudes because the air pressure is lower. For example, on
+Mount Everest, water boils at around 70 degrees Celsius.
+"""
+QA_QUESTIONS = [
+    "At what temperature does water boil on Mount Everest?",
+    "Why does the boiling point decrease at higher altitudes?",
+]
+
+PARSE_SENTENCES = [
+    "Flying planes can be dangerous",
+    "The parents of the bride and the groom were flying",
+    "The groom loves dangerous planes more than the bride",
+]
+
+CNF_GRAMMAR = """
+S -> NP VP [1.0]
+NP -> Det N [0.5]
+NP -> N [0.3]
+NP -> Det Adj N [0.2]
+VP -> V NP [0.6]
+VP -> V [0.3]
+VP -> 'quickly' V [0.1]
+Det -> 'the' [1.0]
+N -> 'cat' [0.5]
+N -> 'dog' [0.5]
+Adj -> 'big' [1.0]
+V -> 'chases' [1.0]
+"""
+
+
+class BenchmarkSkipped(Exception):
+    pass
+
+
+def load_module(relative_path, name):
+    """ Import a lab script by path (the labs are plain folders, not packages). """
+    path = os.path.join(ROOT, relative_path)
+    sys.path.insert(0, os.path.dirname(path))
+    try:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except (ImportError, OSError) as e:
+        raise BenchmarkSkipped(f"{type(e).__name__}: {e}") from e
+    finally:
+        sys.path.pop(0)
+    return module
+
+
+def read_corpus(scale):
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        return "\n".join([f.read()] * scale)
+
+
+def letters_name(i):
+    """ 0 -> "A", 25 -> "Z", 26 -> "BA", ... (bonus.py treats symbols with digits as terminals) """
+    name = ""
+    while True:
+        name = chr(ord("A") + i % 26) + name
+        i //= 26
+        if i == 0:
+            return name
+
+
+def synthetic_grammar(scale):
+    """ Bundled example grammar plus generated rules with ε, unit, mixed and long productions. """
+    rng = random.Random(0)
+    lines = CNF_GRAMMAR.strip().split("\n")
+    non_terminals = ["NP", "VP", "Det", "N", "Adj", "V"]
+    generated = []
+    for i in range(200 * scale):
+        lhs = "G" + letters_name(i)
+        # right-hand sides refer to earlier generated symbols, so nullable and unit chains propagate
+        symbols = non_terminals + generated[-10:] + [f"'w{i}'"]
+        rhs = [rng.choice(symbols) for _ in range(rng.randint(2, 5))]
+        lines.append(f"{lhs} -> {' '.join(rhs)} [0.5]")
+        lines.append(f"{lhs} -> {rng.choice(non_terminals + generated[-10:])} [0.3]")
+        lines.append(f"{lhs} -> {'ε' if i % 3 == 0 else repr('t%d' % i)} [0.2]")
+        lines.append(f"S -> {lhs} VP [0.1]")
+        generated.append(lhs)
+    return "\n".join(lines)
+
+
+# Each benchmark has a setup (imports, model loading, inputs; not timed) and a run.
+# Hot paths are instrumented from the outside, so the lab code does not depend on the profiler.
+
+def setup_bpe(scale):
+    bpe_model = load_module("Lab2/bpe_model.py", "bpe_model")
+    try:
+        bpe_model.SimpleBPE(pretokenizer_name="gpt2")
+    except OSError as e:
+        raise BenchmarkSkipped(f"gpt2 pre-tokenizer not cached: {e}") from e
+    corpus = [line for line in read_corpus(scale).split("\n") if line.strip()]
+    return bpe_model, corpus
+
+
+def run_bpe(profiler, state):
+    bpe_model, corpus = state
+    with profiler.instrument(
+        bpe_model.SimpleBPE,
+        timed={
+            "train_bpe": "bpe.train",
+            "pretokenize_and_count": "bpe.pretokenize",
+            "build_alphabet_and_splits": "bpe.alphabet",
+            "tokenize": "bpe.encode",
+        },
+        counted={"compute_pair_freqs": "bpe.pair_freqs", "merge_pair_in_splits": "bpe.merges"},
+    ):
+        with profiler.stage("bpe.init"):
+            bpe = bpe_model.SimpleBPE(pretokenizer_name="gpt2")
+        bpe.train_bpe(corpus, target_vocab_size=300)
+        for line in corpus[:50]:
+            bpe.tokenize(line)
+
+
+def setup_ngram(scale):
+    ngram = load_module("Lab2/ngram.py", "ngram")
+    sentences = [s for s in read_corpus(1).split(".") if s.strip()]
+    return ngram, read_corpus(scale), sentences
+
+
+def run_ngram(profiler, state):
+    ngram, corpus, sentences = state
+    with profiler.instrument(
+        ngram.NGramLM,
+        timed={"train": "ngram.train", "preprocess": "ngram.preprocess"},
+        counted={"ngram_prob": "ngram.ngram_prob"},
+    ):
+        for n in (2, 3, 4):
+            model = ngram.NGramLM(n)
+            model.train(corpus)
+            with profiler.stage("ngram.score"):
+                for sentence in sentences:
+                    model.sentence_prob(sentence)
+
+
+def setup_gpt2(scale):
+    task4 = load_module("Lab2/task4.py", "task4")
+    return task4, ["This autumn is the", "The weather in Iasi", "Natural language processing is"] * scale
+
+
+def run_gpt2(profiler, state):
+    task4, prompts = state
+    import torch
+    # sampling is on in predict_next_word, fix the seed so both runs generate the same number of tokens
+    torch.manual_seed(0)
+    with profiler.instrument(task4, timed={"predict_next_word": "gpt2.generate_step"}):
+        for prompt in prompts:
+            with profiler.stage("gpt2.predict_next_words"):
+                task4.predict_next_words(prompt, num_words=2)
+
+
+def setup_qa(scale):
+    qa = load_module("Lab3/main.py", "qa_main")
+    return qa, QA_QUESTIONS * scale
+
+
+def run_qa(profiler, state):
+    qa, questions = state
+    with profiler.instrument(qa, timed={"question_answer": "qa.question_answer"}):
+        # question_answer prints its answer, keep the benchmark output readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            for question in questions:
+                qa.question_answer(question, QA_TEXT)
+
+
+def setup_cnf(scale):
+    bonus = load_module("Lab4/bonus.py", "bonus")
+    return bonus, synthetic_grammar(scale)
+
+
+def run_cnf(profiler, state):
+    bonus, grammar = state
+    converter = bonus.CFGtoCNFConverter()
+    with profiler.stage("cnf.read_grammar"):
+        converter.read_grammar(grammar)
+    # the steps are called one by one because convert_to_cnf prints the grammar after each of them
+    for step in ("step1_eliminate_epsilon", "step2_eliminate_unit_rules",
+                 "step3_eliminate_mixed_rules", "step4_eliminate_long_rules"):
+        with profiler.stage(f"cnf.{step}"):
+            getattr(converter, step)()
+    profiler.count("cnf.new_non_terminals", converter.new_non_terminals_count)
+
+
+def setup_chart(scale):
+    task1and2 = load_module("Lab4/task1and2.py", "task1and2")
+    return task1and2, [s.lower().split() for s in PARSE_SENTENCES] * scale
+
+
+def run_chart(profiler, state):
+    task1and2, sentences = state
+    for sent in sentences:
+        with profiler.stage("chart.parse"):
+            profiler.count("chart.trees", sum(1 for _ in task1and2.parser.parse(sent)))
+
+
+def setup_dependency(scale):
+    task3 = load_module("Lab4/task3.py", "task3")
+    return task3, PARSE_SENTENCES * scale
+
+
+def run_dependency(profiler, state):
+    task3, sentences = state
+    for sent in sentences:
+        with profiler.stage("dependency.parse"):
+            doc = task3.nlp(sent)
+        profiler.count("dependency.tokens", len(doc))
+
+
+BENCHMARKS = {
+    "bpe": (setup_bpe, run_bpe),
+    "ngram": (setup_ngram, run_ngram),
+    "gpt2": (setup_gpt2, run_gpt2),
+    "qa": (setup_qa, run_qa),
+    "cnf": (setup_cnf, run_cnf),
+    "chart": (setup_chart, run_chart),
+    "dependency": (setup_dependency, run_dependency),
+}
+
+
+def run_benchmark(name, scale, repeat, trace_memory, sink=None):
+    """
+    One untimed warm-up run, `repeat` timed runs without tracemalloc, then (with
+    `trace_memory`) one more run only to collect the memory peaks, so the timings do not
+    depend on the --memory flag. Timings are the best of the timed runs: for every stage,
+    the minimum over the runs of its total time in that run.
+    """
+    setup, run = BENCHMARKS[name]
+    try:
+        state = setup(scale)
+    except BenchmarkSkipped as e:
+        return {"status": "skipped", "reason": str(e)}
+    except Exception as e:
+        return {"status": "error", "reason": f"{type(e).__name__}: {e}"}
+
+    wall = []
+    summaries = []
+    try:
+        run(Profiler(), state)
+        for _ in range(repeat):
+            profiler = Profiler(sink=sink)
+            start = time.perf_counter()
+            run(profiler, state)
+            wall.append(time.perf_counter() - start)
+            summaries.append(profiler.summary())
+        if trace_memory:
+            with Profiler(sink=sink, trace_memory=True) as profiler:
+                run(profiler, state)
+            peaks = profiler.summary()["stages"]
+    except Exception as e:
+        # keep going with the other benchmarks, compare_benchmarks.py reports this as a failure
+        return {"status": "error", "reason": f"{type(e).__name__}: {e}"}
+
+    stages = {}
+    for stage, stats in summaries[-1]["stages"].items():
+        totals = [summary["stages"][stage]["total_s"] for summary in summaries if stage in summary["stages"]]
+        stages[stage] = {"calls": stats["calls"], "best_s": min(totals), "median_s": statistics.median(totals)}
+        if trace_memory and stage in peaks:
+            stages[stage]["peak_bytes"] = peaks[stage]["peak_bytes"]
+    return {
+        "status": "ok",
+        "wall_s": min(wall),
+        "wall_median_s": statistics.median(wall),
+        "wall_runs_s": wall,
+        "stages": stages,
+        # counts of one run, they do not depend on timing
+        "counters": summaries[-1]["counters"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite for the labs.")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run (default: all)")
+    parser.add_argument("--scale", type=int, default=1, help="input size multiplier")
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per benchmark (after one warm-up run)")
+    parser.add_argument("--memory", action="store_true", help="record tracemalloc peaks per stage (in an extra, untimed run)")
+    parser.add_argument("--events", help="also write every stage event of this run to this JSON lines file (overwritten)")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="where to write the results")
+    args = parser.parse_args()
+    if args.scale <= 0 or args.repeat <= 0:
+        parser.error("--scale and --repeat must be positive")
+
+    sink = JsonLinesSink(args.events) if args.events else None
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": args.scale,
+            "repeat": args.repeat,
+            "memory": args.memory,
+        },
+        "benchmarks": {},
+    }
+    try:
+        for name in args.only or BENCHMARKS:
+            print(f"Running {name}...")
+            result = run_benchmark(name, args.scale, args.repeat, args.memory, sink)
+            results["benchmarks"][name] = result
+            if result["status"] == "ok":
+                print(f"  {result['wall_s']:.4f}s (best of {args.repeat})")
+            else:
+                print(f"  {result['status']}: {result['reason']}")
+    finally:
+        if sink is not None:
+            sink.close()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
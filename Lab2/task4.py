@@ -7,34 +7,32 @@ model = GPT2LMHeadModel.from_pretrained("gpt2")
 model.eval()
 
 
-input_text = "This autumn is the" 
+def predict_next_word(input_text):
+    input_ids = tokenizer.encode(input_text, return_tensors='pt')
 
+    output_ids = model.generate(
+        input_ids,
+        max_new_tokens=1,       
+        do_sample=True,        
+        top_k=50,              
+        top_p=0.95,             
+        temperature=0.8      
+    )
 
-input_ids = tokenizer.encode(input_text, return_tensors='pt')
+    return tokenizer.decode(output_ids[0], skip_special_tokens=True)
 
 
-output_ids = model.generate(
-    input_ids,
-    max_new_tokens=1,       
-    do_sample=True,        
-    top_k=50,              
-    top_p=0.95,             
-    temperature=0.8      
-)
+def predict_next_words(input_text, num_words=2):
+    output_text = input_text
+    for _ in range(num_words):
+        output_text = predict_next_word(output_text)
+    return output_text
 
-output_text1 = tokenizer.decode(output_ids[0], skip_special_tokens=True)
 
-input_ids2 = tokenizer.encode(output_text1, return_tensors='pt')
+if __name__ == "__main__":
+    input_text = "This autumn is the" 
 
-output_ids2 = model.generate(
-    input_ids2,
-    max_new_tokens=1,       
-    do_sample=True,        
-    top_k=50,              
-    top_p=0.95,             
-    temperature=0.8      
-)
-output_text2 = tokenizer.decode(output_ids2[0], skip_special_tokens=True)
+    output_text2 = predict_next_words(input_text, num_words=2)
 
-print(f"Input sequence: {input_text}")
-print(f"Predicted continuation: {output_text2}")
+    print(f"Input sequence: {input_text}")
+    print(f"Predicted continuation: {output_text2}")
@@ -18,15 +18,16 @@ Adv -> 'more'
 
 parser = ChartParser(grammar)
 
-sentences = [
-    "Flying planes can be dangerous".split(),
-    "The parents of the bride and the groom were flying".split(),
-    "The groom loves dangerous planes more than the bride".split()
-]
+if __name__ == "__main__":
+    sentences = [
+        "Flying planes can be dangerous".split(),
+        "The parents of the bride and the groom were flying".split(),
+        "The groom loves dangerous planes more than the bride".split()
+    ]
 
-for sent in sentences:
-    sent = [word.lower() for word in sent]
-    print(f"\nSentence: {' '.join(sent)}")
-    for tree in parser.parse(sent):
-        print(tree)
-        tree.pretty_print()
+    for sent in sentences:
+        sent = [word.lower() for word in sent]
+        print(f"\nSentence: {' '.join(sent)}")
+        for tree in parser.parse(sent):
+            print(tree)
+            tree.pretty_print()